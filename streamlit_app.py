@@ -9,8 +9,11 @@ from datetime import datetime
 from t_utils import (
     generate_constellation_tle,
     create_constellation_plots,
+    create_ground_track_plotly,
     generate_tle_file_content,
-    create_validation_report
+    create_validation_report,
+    plane_counts,
+    summary_stats
 )
 
 # Function to generate random constellation name
@@ -51,6 +54,204 @@ def get_random_parameters():
     
     return altitude, inclination, num_planes, sats_per_plane, walker_F
 
+# Above this many satellites the ground track is drawn client-side with WebGL
+_PLOTLY_MIN_SATS = 2000
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_generate(params):
+    """Generate constellation TLEs, cached on the input parameters, random seed and epoch"""
+    altitude, inclination, num_planes, sats_per_plane, walker_F, name, seed, generated_at = params
+    rng = np.random.default_rng(seed)
+    return generate_constellation_tle(
+        altitude, inclination, num_planes, sats_per_plane, walker_F, name,
+        rng=rng, epoch=generated_at
+    )
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _cached_plots(params, include_ground_track):
+    """Build the constellation figure, cached on the same key as the TLE data
+
+    include_ground_track has no default: Streamlit keys only the arguments
+    actually passed, so every caller must pass it for calls to share an entry.
+    """
+    _, constellation_data = _cached_generate(params)
+    return create_constellation_plots(constellation_data, include_ground_track)
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _cached_ground_track_plotly(params):
+    """Build the interactive ground track figure, cached on the generation parameters"""
+    _, constellation_data = _cached_generate(params)
+    return create_ground_track_plotly(constellation_data)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_display_png(params, include_ground_track):
+    """On-screen PNG of the constellation figure at its own 100 dpi, rendered once
+
+    Shown with st.image rather than st.pyplot, which re-renders the figure at
+    200 dpi with bbox_inches='tight' on every rerun.
+    """
+    buf = io.BytesIO()
+    _cached_plots(params, include_ground_track).savefig(buf, format='png')
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_plot_png(params):
+    """PNG export of the constellation figure, rendered once per parameter set"""
+    buf = io.BytesIO()
+    # bbox_inches='tight' would render the figure twice; tight_layout already fits it
+    _cached_plots(params, True).savefig(buf, format='png', dpi=150)
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_tle_bytes(params, _tle_lines):
+    """TLE file content for the download button, cached on the generation parameters
+
+    Built from the lines this run already holds (not hashed) so the download
+    always matches the preview.
+    """
+    return generate_tle_file_content(_tle_lines)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_report(params, _constellation_data):
+    """Validation report text, cached on the generation parameters"""
+    return create_validation_report(_constellation_data)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_csv_bytes(params, _constellation_data):
+    """Full satellite data CSV, cached on the generation parameters"""
+    df = pd.DataFrame(_constellation_data['satellite_data'], copy=False)
+    return df.to_csv(index=False).encode('utf-8')
+
+@st.fragment
+def render_visualization_tab(params, constellation_data):
+    """Visualization tab: constellation plots and PNG download"""
+    constellation_name = params[5]
+    st.subheader("Constellation Visualization")
+
+    # Generate and display plots
+    if constellation_data['total_satellites'] > _PLOTLY_MIN_SATS:
+        # Large constellations: ground track rendered in the browser, the
+        # other three panels stay on matplotlib
+        st.plotly_chart(_cached_ground_track_plotly(params), width='stretch')
+        st.image(_cached_display_png(params, False))
+
+        # The full 4-panel figure is only built and rendered when requested
+        if st.button("🖼️ Prepare Plots (PNG)"):
+            st.session_state.png_export_params = params
+        show_download = st.session_state.get('png_export_params') == params
+    else:
+        st.image(_cached_display_png(params, True))
+        show_download = True
+
+    # Download plot
+    if show_download:
+        st.download_button(
+            label="📥 Download Plots (PNG)",
+            data=_cached_plot_png(params),
+            file_name=f"{constellation_name}_plots.png",
+            mime="image/png"
+        )
+
+@st.fragment
+def render_tle_tab(params, tle_lines, constellation_data):
+    """TLE Data tab: preview and full TLE file download"""
+    constellation_name = params[5]
+    total_sats = constellation_data['total_satellites']
+    num_planes = constellation_data['num_planes']
+    st.subheader("Generated TLE Data")
+
+    # Show first few TLE entries as preview
+    st.markdown("**Preview (first 5 satellites):**")
+    preview_lines = tle_lines[:15]  # 5 satellites * 3 lines each
+    st.code('\n'.join(preview_lines), language='text')
+
+    # Download TLE file with custom name
+    tle_content = _cached_tle_bytes(params, tle_lines)
+    st.download_button(
+        label="📥 Download Complete TLE File (.txt)",
+        data=tle_content,
+        file_name=f"{constellation_name}_{total_sats}sats.txt",
+        mime="text/plain"
+    )
+
+    st.info(f"📊 Generated {total_sats} satellites across {num_planes} orbital planes")
+
+@st.fragment
+def render_report_tab(params, constellation_data):
+    """Report tab: validation report and download"""
+    constellation_name = params[5]
+    st.subheader("Validation Report")
+
+    report = _cached_report(params, constellation_data)
+    st.text(report)
+
+    # Download report with custom name
+    st.download_button(
+        label="📥 Download Report (.txt)",
+        data=report,
+        file_name=f"{constellation_name}_report.txt",
+        mime="text/plain"
+    )
+
+@st.fragment
+def render_statistics_tab(params, constellation_data):
+    """Statistics tab: distribution tables and CSV download"""
+    constellation_name = params[5]
+    st.subheader("Satellite Statistics")
+
+    # Create DataFrame from satellite data
+    sat_data = constellation_data['satellite_data']
+    df = pd.DataFrame(sat_data, copy=False)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("**RAAN Distribution:**")
+        raan_stats = summary_stats(sat_data['raan'], 'raan')
+        st.dataframe(raan_stats)
+
+        st.markdown("**Mean Anomaly Distribution:**")
+        ma_stats = summary_stats(sat_data['mean_anomaly'], 'mean_anomaly')
+        st.dataframe(ma_stats)
+
+    with col2:
+        st.markdown("**Satellites by Plane:**")
+        st.dataframe(plane_counts(sat_data['plane']).head(10))
+
+        st.markdown("**Sample Satellite Data:**")
+        st.dataframe(df[['name', 'plane', 'norad_id', 'raan', 'mean_anomaly']].head(10))
+
+    # Full data download with custom name
+    csv_data = _cached_csv_bytes(params, constellation_data)
+    st.download_button(
+        label="📥 Download Full Satellite Data (.csv)",
+        data=csv_data,
+        file_name=f"{constellation_name}_data.csv",
+        mime="text/csv"
+    )
+
+@st.fragment
+def render_results(params, tle_lines, constellation_data):
+    """Render the output tabs, isolated from reruns of the rest of the page"""
+    # Tab selector backed by session state so only the active tab's body runs;
+    # st.tabs would execute (and serialize) every tab on each rerun
+    active_tab = st.radio(
+        "View",
+        ["📊 Visualization", "📄 TLE Data", "📋 Report", "📈 Statistics"],
+        key='active_tab',
+        horizontal=True,
+        label_visibility="collapsed"
+    )
+
+    if active_tab == "📊 Visualization":
+        render_visualization_tab(params, constellation_data)
+    elif active_tab == "📄 TLE Data":
+        render_tle_tab(params, tle_lines, constellation_data)
+    elif active_tab == "📋 Report":
+        render_report_tab(params, constellation_data)
+    else:
+        render_statistics_tab(params, constellation_data)
+
 def main():
     """Main application"""
 
@@ -148,6 +349,10 @@ def main():
     # Generate button
     if st.sidebar.button("🚀 Generate Constellation", type="primary"):
         st.session_state.generate_constellation = True
+        # Fresh seed and epoch per click; other reruns reuse the cached
+        # constellation, whose output depends only on its cache key
+        st.session_state.rng_seed = random.randint(0, 2**32 - 1)
+        st.session_state.generated_at = datetime.now()
 
     # Information section
     with st.sidebar.expander("ℹ️ About Walker Constellations"):
@@ -186,97 +391,12 @@ def main():
         # Generate constellation
         with st.spinner("Generating constellation TLE data..."):
             try:
-                tle_lines, constellation_data = generate_constellation_tle(
-                    altitude, inclination, num_planes, sats_per_plane, walker_F, constellation_name
-                )
-
-                # Create tabs for different outputs
-                tab1, tab2, tab3, tab4 = st.tabs(["📊 Visualization", "📄 TLE Data", "📋 Report", "📈 Statistics"])
-
-                with tab1:
-                    st.subheader("Constellation Visualization")
-
-                    # Generate and display plots
-                    fig = create_constellation_plots(constellation_data)
-                    st.pyplot(fig)
-
-                    # Download plot
-                    buf = io.BytesIO()
-                    fig.savefig(buf, format='png', dpi=300, bbox_inches='tight')
-                    buf.seek(0)
-                    st.download_button(
-                        label="📥 Download Plots (PNG)",
-                        data=buf.getvalue(),
-                        file_name=f"{constellation_name}_plots.png",
-                        mime="image/png"
-                    )
-
-                with tab2:
-                    st.subheader("Generated TLE Data")
-
-                    # Show first few TLE entries as preview
-                    st.markdown("**Preview (first 5 satellites):**")
-                    preview_lines = tle_lines[:15]  # 5 satellites * 3 lines each
-                    st.code('\n'.join(preview_lines), language='text')
-
-                    # Download TLE file with custom name
-                    tle_content = generate_tle_file_content(tle_lines)
-                    st.download_button(
-                        label="📥 Download Complete TLE File (.txt)",
-                        data=tle_content,
-                        file_name=f"{constellation_name}_{total_sats}sats.txt",
-                        mime="text/plain"
-                    )
-
-                    st.info(f"📊 Generated {total_sats} satellites across {num_planes} orbital planes")
-
-                with tab3:
-                    st.subheader("Validation Report")
-
-                    report = create_validation_report(constellation_data)
-                    st.text(report)
-
-                    # Download report with custom name
-                    st.download_button(
-                        label="📥 Download Report (.txt)",
-                        data=report,
-                        file_name=f"{constellation_name}_report.txt",
-                        mime="text/plain"
-                    )
-
-                with tab4:
-                    st.subheader("Satellite Statistics")
-
-                    # Create DataFrame from satellite data
-                    df = pd.DataFrame(constellation_data['satellite_data'])
-
-                    col1, col2 = st.columns(2)
-
-                    with col1:
-                        st.markdown("**RAAN Distribution:**")
-                        raan_stats = df['raan'].describe()
-                        st.dataframe(raan_stats)
-
-                        st.markdown("**Mean Anomaly Distribution:**")
-                        ma_stats = df['mean_anomaly'].describe()
-                        st.dataframe(ma_stats)
-
-                    with col2:
-                        st.markdown("**Satellites by Plane:**")
-                        plane_counts = df['plane'].value_counts().sort_index()
-                        st.dataframe(plane_counts.head(10))
-
-                        st.markdown("**Sample Satellite Data:**")
-                        st.dataframe(df[['name', 'plane', 'norad_id', 'raan', 'mean_anomaly']].head(10))
-
-                    # Full data download with custom name
-                    csv_data = df.to_csv(index=False)
-                    st.download_button(
-                        label="📥 Download Full Satellite Data (.csv)",
-                        data=csv_data,
-                        file_name=f"{constellation_name}_data.csv",
-                        mime="text/csv"
-                    )
+                params = (altitude, inclination, num_planes, sats_per_plane, walker_F,
+                          constellation_name, st.session_state.rng_seed,
+                          st.session_state.generated_at)
+                tle_lines, constellation_data = _cached_generate(params)
+
+                render_results(params, tle_lines, constellation_data)
 
             except Exception as e:
                 st.error(f"Error generating constellation: {str(e)}")
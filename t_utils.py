@@ -1,39 +1,144 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import pandas as pd
+import plotly.graph_objects as go
+from PIL import Image
 from datetime import datetime
-import random
+import io
+import re
 import string
+import streamlit as st
+from numba import njit
 
-def calculate_checksum(line):
-    """Calculate TLE checksum"""
+@njit(cache=True)
+def _checksum(buf):
+    """Sum TLE checksum digits over the raw ASCII bytes of a line"""
     s = 0
-    for char in line[:68]:
-        if char.isdigit():
-            s += int(char)
-        elif char == '-':
+    for i in range(min(68, len(buf))):
+        c = buf[i]
+        if 48 <= c <= 57:  # '0'-'9'
+            s += c - 48
+        elif c == 45:  # '-'
             s += 1
     return s % 10
 
-def generate_random_launch_info():
-    """Generate random launch year, number, and piece for diversity"""
-    # Random launch year (last 5 years)
-    current_year = datetime.now().year
-    launch_years = list(range(current_year - 4, current_year + 1))
-    launch_year = random.choice(launch_years)
-
-    # Random launch number (1-999)
-    launch_number = random.randint(1, 999)
-
-    # Random launch piece (A-Z, AA-ZZ pattern)
-    pieces = [chr(i) for i in range(ord('A'), ord('Z') + 1)]
-    pieces.extend([chr(i) + chr(j) for i in range(ord('A'), ord('Z') + 1)
-                   for j in range(ord('A'), ord('Z') + 1)])
-    launch_piece = random.choice(pieces)
-
-    return launch_year % 100, launch_number, launch_piece
-
-def generate_constellation_tle(altitude, inclination, num_planes, sats_per_plane, walker_F, constellation_name="CONSTELLATION"):
+# Compile the checksum kernel at import so the first generation isn't hit with JIT latency
+_checksum(b'0' * 68)
+
+@njit(cache=True)
+def _put_bytes(buf, pos, src):
+    """Copy src into buf at pos, dropping anything past the 68-char line body"""
+    for c in src:
+        if pos < 68:
+            buf[pos] = c
+        pos += 1
+    return pos
+
+@njit(cache=True)
+def _put_int(buf, pos, value, width):
+    """Write a zero-padded integer like f"{value:0{width}d}" (wider values are not cut)"""
+    ndigits = 1
+    v = value
+    while v >= 10:
+        v //= 10
+        ndigits += 1
+    ndigits = max(ndigits, width)
+    for k in range(ndigits - 1, -1, -1):
+        if pos + k < 68:
+            buf[pos + k] = 48 + value % 10
+        value //= 10
+    return pos + ndigits
+
+@njit(cache=True)
+def _put_angle(buf, pos, x):
+    """Write a non-negative angle like f"{x:8.4f}", correctly rounded"""
+    # Exact x * 1e4 as hi + lo (Dekker two-product), so ties are detected exactly
+    hi = x * 1e4
+    split = 134217729.0  # 2**27 + 1
+    t = split * x
+    x_hi = t - (t - x)
+    x_lo = x - x_hi
+    lo = ((x_hi * 1e4 - hi) + x_lo * 1e4)
+    scaled = np.floor(hi)
+    excess = (hi - scaled - 0.5) + lo
+    if excess > 0 or (excess == 0 and scaled % 2 == 1):
+        scaled += 1
+    value = np.int64(scaled)
+    whole = value // 10000
+
+    # Right-align the integer part in a 3-char field
+    ndigits = 1
+    v = whole
+    while v >= 10:
+        v //= 10
+        ndigits += 1
+    for _ in range(3 - ndigits):
+        pos = _put_bytes(buf, pos, b' ')
+    pos = _put_int(buf, pos, whole, 1)
+    pos = _put_bytes(buf, pos, b'.')
+    return _put_int(buf, pos, value % 10000, 4)
+
+@njit(cache=True)
+def _format_tle_block(norad, years, numbers, pieces, raan, M,
+                      line1_tail, line2_inc, line2_mid, line2_tail):
+    """Format both lines (with checksums) of every satellite into an (N, 2, 69) byte array"""
+    n_sats = norad.shape[0]
+    out = np.empty((n_sats, 2, 69), dtype=np.uint8)
+    for i in range(n_sats):
+        # Line 1: "1 NNNNNU YYNNNPPP <epoch> ..." truncated to 68 chars
+        buf = out[i, 0]
+        buf[:68] = 32
+        pos = _put_bytes(buf, 0, b'1 ')
+        pos = _put_int(buf, pos, norad[i], 5)
+        pos = _put_bytes(buf, pos, b'U ')
+        pos = _put_int(buf, pos, years[i], 2)
+        pos = _put_int(buf, pos, numbers[i], 3)
+        pos = _put_bytes(buf, pos, pieces[i])
+        _put_bytes(buf, pos, line1_tail)
+        buf[68] = 48 + _checksum(buf)
+
+        # Line 2: "2 NNNNN <inc> <raan> <ecc> <omega> <M> <n>    1"
+        buf = out[i, 1]
+        buf[:68] = 32
+        pos = _put_bytes(buf, 0, b'2 ')
+        pos = _put_int(buf, pos, norad[i], 5)
+        pos = _put_bytes(buf, pos, line2_inc)
+        pos = _put_angle(buf, pos, raan[i])
+        pos = _put_bytes(buf, pos, line2_mid)
+        pos = _put_angle(buf, pos, M[i])
+        _put_bytes(buf, pos, line2_tail)
+        buf[68] = 48 + _checksum(buf)
+    return out
+
+# Compile the formatter at import as well (one dummy satellite)
+_format_tle_block(np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64),
+                  np.zeros(1, dtype=np.int64), np.zeros((1, 3), dtype=np.uint8),
+                  np.zeros(1), np.zeros(1), *[np.frombuffer(b'', dtype=np.uint8)] * 4)
+
+# Characters removed from constellation names in satellite names
+# (\w is exactly str.isalnum() plus '_', so Unicode letters are kept)
+_NAME_RE = re.compile(r'[^\w-]')
+
+# Launch piece designators (A-Z, AA-ZZ pattern)
+_LAUNCH_PIECES = np.array([chr(i) for i in range(ord('A'), ord('Z') + 1)] +
+                          [chr(i) + chr(j) for i in range(ord('A'), ord('Z') + 1)
+                           for j in range(ord('A'), ord('Z') + 1)], dtype='<U2')
+
+def batch_launch_info(n, rng=None, current_year=None):
+    """Generate random launch years, numbers, and pieces for n satellites at once"""
+    if rng is None:
+        rng = np.random.default_rng()
+    if current_year is None:
+        current_year = datetime.now().year
+
+    years = rng.integers(current_year - 4, current_year + 1, size=n) % 100
+    numbers = rng.integers(1, 1000, size=n)
+    pieces = _LAUNCH_PIECES[rng.integers(0, len(_LAUNCH_PIECES), size=n)]
+    return years, numbers, pieces
+
+def generate_constellation_tle(altitude, inclination, num_planes, sats_per_plane, walker_F, constellation_name="CONSTELLATION",
+                               rng=None, epoch=None):
     """
     Generate TLE data for a Walker constellation
 
@@ -44,12 +149,17 @@ def generate_constellation_tle(altitude, inclination, num_planes, sats_per_plane
     - sats_per_plane: Number of satellites per plane
     - walker_F: Walker F parameter (phasing factor)
     - constellation_name: Name for the constellation satellites
+    - rng: numpy.random.Generator for NORAD IDs and launch info (fresh one if None)
+    - epoch: datetime used for the TLE epoch and launch years (now if None)
 
     Returns:
     - tle_lines: List of TLE lines
     - constellation_data: Dictionary with constellation parameters
     """
 
+    if rng is None:
+        rng = np.random.default_rng()
+
     # Constants
     Re = 6378.137  # Earth radius (km)
     mu = 398600.4418  # Earth gravitational parameter (km^3/s^2)
@@ -61,7 +171,7 @@ def generate_constellation_tle(altitude, inclination, num_planes, sats_per_plane
     omega = 0  # argument of perigee (deg)
 
     # Epoch calculation
-    current_date = datetime.now()
+    current_date = epoch if epoch is not None else datetime.now()
     epoch_year = current_date.year % 100
     day_of_year = current_date.timetuple().tm_yday
     hour_fraction = (current_date.hour + current_date.minute/60 +
@@ -75,72 +185,74 @@ def generate_constellation_tle(altitude, inclination, num_planes, sats_per_plane
 
     # Storage for TLE lines and satellite data
     tle_lines = []
-    sat_data = []
 
     # Generate NORAD IDs starting from random number in 10000-90000 range, then sequential
-    base_norad_id = random.randint(10000, 90000)
+    base_norad_id = int(rng.integers(10000, 90001))
     
-    sat_counter = 0
-
-    for plane in range(num_planes):
-        # RAAN for this plane
-        raan = (plane * delta_raan) % 360
-
-        # Walker phase offset for this plane
-        walker_phase_offset = (plane * phase_unit) % 360
-
-        for sat in range(sats_per_plane):
-            # Mean anomaly within the plane
-            in_plane_spacing = 360 / sats_per_plane
-            M = (sat * in_plane_spacing + walker_phase_offset) % 360
-
-            # Sequential NORAD ID starting from random base
-            sat_number = base_norad_id + sat_counter
-            launch_year, launch_number, launch_piece = generate_random_launch_info()
-
-            # Clean constellation name (remove special characters, convert to uppercase)
-            clean_name = ''.join(c for c in constellation_name if c.isalnum() or c in ['_', '-']).upper()
-            
-            # Satellite name in format: NAME###-##
-            sat_name = f"{clean_name}{plane+1:03d}-{sat+1:02d}"
-
-            # Create epoch string
-            epoch_str = f"{epoch_year:02d}{epoch_day:012.8f}"
-
-            # Line 1
-            line1_body = (f"1 {sat_number:05d}U {launch_year:02d}"
-                         f"{launch_number:03d}{launch_piece:<3s} {epoch_str} "
-                         f" .00000000  00000+0  00000-0 0  9999")
-
-            # Ensure exactly 68 characters
-            line1_body = line1_body[:68].ljust(68)
-            chk1 = calculate_checksum(line1_body)
-            line1 = line1_body + str(chk1)
-
-            # Line 2
-            line2_body = (f"2 {sat_number:05d} {inclination:8.4f} {raan:8.4f} "
-                         f"{int(e*1e7):07d} {omega:8.4f} {M:8.4f} "
-                         f"{n:11.8f}    1")
-
-            # Ensure exactly 68 characters
-            line2_body = line2_body[:68].ljust(68)
-            chk2 = calculate_checksum(line2_body)
-            line2 = line2_body + str(chk2)
-
-            # Add to results
-            tle_lines.extend([sat_name, line1, line2])
-
-            # Store satellite data for analysis
-            sat_data.append({
-                'plane': plane + 1,
-                'sat': sat + 1,
-                'norad_id': sat_number,
-                'raan': raan,
-                'mean_anomaly': M,
-                'name': sat_name
-            })
-
-            sat_counter += 1
+    # Vectorized orbital elements: planes along axis 0, in-plane slots along axis 1
+    plane_idx = np.arange(num_planes)[:, None]
+    sat_idx = np.arange(sats_per_plane)[None, :]
+
+    # RAAN and Walker phase offset for each plane
+    raan = (plane_idx * delta_raan) % 360
+    walker_phase_offset = (plane_idx * phase_unit) % 360
+
+    # Mean anomaly within the plane
+    in_plane_spacing = 360 / sats_per_plane
+    M = (sat_idx * in_plane_spacing + walker_phase_offset) % 360
+
+    # Sequential NORAD IDs starting from random base
+    norad = base_norad_id + (plane_idx * sats_per_plane + sat_idx)
+
+    # Flatten to one entry per satellite (plane-major order)
+    planes_arr = np.repeat(plane_idx.ravel() + 1, sats_per_plane)
+    sats_arr = np.tile(sat_idx.ravel() + 1, num_planes)
+    norad_arr = norad.ravel()
+    raan_arr = np.repeat(raan.ravel(), sats_per_plane)
+    M_arr = M.ravel()
+
+    # Random launch info for every satellite, drawn in one batch
+    launch_years, launch_numbers, launch_pieces = batch_launch_info(total_sats, rng, current_date.year)
+
+    # Clean constellation name (remove special characters, convert to uppercase)
+    clean_name = _NAME_RE.sub('', constellation_name).upper()
+
+    # Create epoch string
+    epoch_str = f"{epoch_year:02d}{epoch_day:012.8f}"
+
+    # Invariant line segments; only NORAD ID, launch designator, RAAN and
+    # mean anomaly are written per satellite by the compiled formatter
+    line1_tail = np.frombuffer(f" {epoch_str}  .00000000  00000+0  00000-0 0  9999".encode('ascii'),
+                               dtype=np.uint8)
+    line2_inc = np.frombuffer(f" {inclination:8.4f} ".encode('ascii'), dtype=np.uint8)
+    line2_mid = np.frombuffer(f" {int(e*1e7):07d} {omega:8.4f} ".encode('ascii'), dtype=np.uint8)
+    line2_tail = np.frombuffer(f" {n:11.8f}    1".encode('ascii'), dtype=np.uint8)
+    piece_codes = np.char.ljust(launch_pieces, 3).astype('S3').view(np.uint8).reshape(-1, 3)
+
+    tle_block = _format_tle_block(norad_arr.astype(np.int64), launch_years.astype(np.int64),
+                                  launch_numbers.astype(np.int64), piece_codes,
+                                  raan_arr, M_arr, line1_tail, line2_inc, line2_mid, line2_tail)
+    tle_text = tle_block.tobytes().decode('ascii')
+
+    # Satellite names in format: NAME###-##
+    sat_names = [f"{clean_name}{plane:03d}-{sat:02d}"
+                 for plane, sat in zip(planes_arr.tolist(), sats_arr.tolist())]
+
+    # Add to results: name, line 1, line 2 per satellite
+    for i, sat_name in enumerate(sat_names):
+        offset = 138 * i
+        tle_lines.extend([sat_name, tle_text[offset:offset + 69], tle_text[offset + 69:offset + 138]])
+
+    # Store satellite data for analysis as one array per column; angles stay
+    # float64 for the CSV export and the RAAN histogram bin edges
+    sat_data = {
+        'plane': planes_arr.astype(np.int16),
+        'sat': sats_arr.astype(np.int16),
+        'norad_id': norad_arr.astype(np.int32),
+        'raan': raan_arr,
+        'mean_anomaly': M_arr,
+        'name': np.array(sat_names)
+    }
 
     # Create constellation data summary
     constellation_data = {
@@ -162,11 +274,8 @@ def generate_constellation_tle(altitude, inclination, num_planes, sats_per_plane
 
     return tle_lines, constellation_data
 
-def draw_earth_map(ax):
-    """Draw a simple Earth map background"""
-    
-    # Set ocean color (dark blue for better contrast)
-    ax.set_facecolor('#003366')
+def draw_earth_features(ax):
+    """Draw the constant Earth map geometry: reference lines and continents"""
     
     # Draw equator
     ax.axhline(y=0, color='yellow', linestyle='-', alpha=0.7, linewidth=2, label='Equator')
@@ -219,6 +328,29 @@ def draw_earth_map(ax):
     ant_lon = [-180, 180, 180, -180, -180]
     ant_lat = [-60, -60, -90, -90, -60]
     ax.fill(ant_lon, ant_lat, color='white', alpha=0.9, edgecolor='black', linewidth=0.5)
+
+# Major cities for reference (lon, lat)
+_CITIES = {
+    'New York': (-74, 40.7),
+    'London': (0, 51.5),
+    'Tokyo': (139.7, 35.7),
+    'Sydney': (151.2, -33.9),
+    'Cairo': (31.2, 30.0),
+    'Sao Paulo': (-46.6, -23.5)
+}
+
+def draw_cities(ax):
+    """Mark major cities for reference"""
+    for city, (lon, lat) in _CITIES.items():
+        ax.plot(lon, lat, 'o', color='red', markersize=4, alpha=0.8)
+        ax.annotate(city, (lon, lat), xytext=(5, 5), textcoords='offset points', 
+                   color='white', fontsize=8, alpha=0.7)
+
+def style_earth_axes(ax):
+    """Apply the Earth map grid, limits, labels and tick colors"""
+    
+    # Set ocean color (dark blue for better contrast)
+    ax.set_facecolor('#003366')
     
     # Add grid
     ax.grid(True, alpha=0.3, linestyle='-', linewidth=0.5, color='white')
@@ -231,101 +363,171 @@ def draw_earth_map(ax):
     
     # Set tick colors
     ax.tick_params(colors='white')
-    
-    # Add major cities for reference
-    cities = {
-        'New York': (-74, 40.7),
-        'London': (0, 51.5),
-        'Tokyo': (139.7, 35.7),
-        'Sydney': (151.2, -33.9),
-        'Cairo': (31.2, 30.0),
-        'Sao Paulo': (-46.6, -23.5)
-    }
-    
-    for city, (lon, lat) in cities.items():
-        ax.plot(lon, lat, 'o', color='red', markersize=4, alpha=0.8)
-        ax.annotate(city, (lon, lat), xytext=(5, 5), textcoords='offset points', 
-                   color='white', fontsize=8, alpha=0.7)
 
-def create_constellation_plots(constellation_data):
-    """Create visualization plots for the constellation"""
+@st.cache_resource
+def _earth_bg_image():
+    """Render the static Earth map features once into a 1200x600 RGBA array"""
+    fig = Figure(figsize=(12, 6), dpi=100, facecolor='#003366')
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    draw_earth_features(ax)
+    ax.set_xlim(-180, 180)
+    ax.set_ylim(-90, 90)
+    ax.set_axis_off()
+    fig.canvas.draw()
+    width, height = fig.canvas.get_width_height()
+    return np.frombuffer(fig.canvas.buffer_rgba(), dtype=np.uint8).reshape(height, width, 4).copy()
+
+def calculate_ground_track(sat_data, inclination):
+    """Approximate sub-satellite longitude/latitude for every satellite"""
+    # Simple approximation for demonstration
+    # In reality, this would require proper orbital mechanics
+    # float32 is plenty for plotting and halves the points shipped to the browser
+    raan = np.asarray(sat_data['raan'], dtype=np.float32)
+    mean_anomaly = np.asarray(sat_data['mean_anomaly'], dtype=np.float32)
+    lons = (raan + mean_anomaly) % 360
+    lons = np.where(lons > 180, lons - 360, lons)  # Convert to -180 to 180 range
+
+    # Calculate latitude based on inclination and mean anomaly
+    lats = np.degrees(np.arcsin(np.sin(np.radians(inclination)) *
+                                np.sin(np.radians(mean_anomaly))))
+    return lons, lats
+
+def plane_counts(planes):
+    """Number of satellites in each plane (planes are numbered 1..P)"""
+    counts = np.bincount(planes)[1:]
+    return pd.Series(counts, index=pd.RangeIndex(1, len(counts) + 1, name='plane'), name='count')
+
+def summary_stats(values, name):
+    """count/mean/std/min/quartiles/max of an array, laid out like Series.describe()"""
+    values = np.asarray(values, dtype=np.float64)
+    q25, q50, q75 = np.percentile(values, [25, 50, 75])
+    std = np.std(values, ddof=1) if values.size > 1 else np.nan
+    return pd.Series(
+        [values.size, np.mean(values), std, np.min(values), q25, q50, q75, np.max(values)],
+        index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+        name=name
+    )
+
+def create_ground_track_plotly(constellation_data):
+    """Create an interactive WebGL ground track plot for large constellations"""
+
+    sat_data = constellation_data['satellite_data']
+    lons, lats = calculate_ground_track(sat_data, constellation_data['inclination'])
+
+    fig = go.Figure(go.Scattergl(
+        x=lons, y=lats, mode='markers',
+        text=np.asarray(sat_data['name']),
+        hovertemplate='%{text}<br>Lon: %{x:.2f}°<br>Lat: %{y:.2f}°<extra></extra>',
+        marker=dict(color=np.asarray(sat_data['plane']), colorscale='Viridis', size=4,
+                    colorbar=dict(title='Plane Number'))
+    ))
+
+    # Cities for reference, drawn as a regular trace so labels stay readable
+    fig.add_trace(go.Scatter(
+        x=[lon for lon, _ in _CITIES.values()], y=[lat for _, lat in _CITIES.values()],
+        mode='markers+text', text=list(_CITIES), textposition='top right',
+        textfont=dict(color='white', size=10), marker=dict(color='red', size=6),
+        hoverinfo='text', showlegend=False
+    ))
+
+    # Same pre-rendered continents and reference lines as the matplotlib map
+    fig.add_layout_image(
+        source=Image.fromarray(_earth_bg_image()),
+        xref='x', yref='y', x=-180, y=90, sizex=360, sizey=180,
+        sizing='stretch', layer='below'
+    )
+
+    fig.update_layout(
+        title=f'Satellite Positions on Earth Map<br>Walker {constellation_data["total_satellites"]}'
+              f'/{constellation_data["num_planes"]}/{constellation_data["walker_F"]}',
+        xaxis=dict(title='Longitude (degrees)', range=[-180, 180], showgrid=False, zeroline=False),
+        yaxis=dict(title='Latitude (degrees)', range=[-90, 90], showgrid=False, zeroline=False),
+        plot_bgcolor='#003366',
+        height=600
+    )
+    return fig
+
+def create_constellation_plots(constellation_data, include_ground_track=True):
+    """Create visualization plots for the constellation
+
+    With include_ground_track=False the Earth map panel is left out (large
+    constellations draw it client-side with create_ground_track_plotly) and
+    the remaining three panels are laid out in a single row.
+    """
 
     sat_data = constellation_data['satellite_data']
-    df = pd.DataFrame(sat_data)
+    df = pd.DataFrame(sat_data, copy=False)
 
     # Create figure with subplots
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    # 100 dpi is the on-screen resolution: the app displays a PNG saved at the
+    # figure's own dpi, and the download passes a higher dpi to savefig
+    # Built without pyplot so the only reference is the caller's (e.g. a cache entry)
+    if include_ground_track:
+        fig = Figure(figsize=(12, 8), dpi=100)
+        ((ax1, ax2), (ax3, ax4)) = fig.subplots(2, 2)
+    else:
+        fig = Figure(figsize=(12, 4), dpi=100)
+        ax1, ax3, ax4 = fig.subplots(1, 3)
 
     # Plot 1: RAAN vs Mean Anomaly
     scatter = ax1.scatter(df['raan'], df['mean_anomaly'],
-                         c=df['plane'], cmap='tab20', alpha=0.7, s=30)
+                         c=df['plane'], cmap='tab20', alpha=0.7, s=30,
+                         rasterized=True)
     ax1.set_xlabel('RAAN (degrees)')
     ax1.set_ylabel('Mean Anomaly (degrees)')
     ax1.set_title('Satellite Distribution in RAAN-MA Space')
     ax1.grid(True, alpha=0.3)
     ax1.set_xlim(0, 360)
     ax1.set_ylim(0, 360)
-    plt.colorbar(scatter, ax=ax1, label='Plane Number')
+    fig.colorbar(scatter, ax=ax1, label='Plane Number')
 
-    # Plot 2: Ground Track Pattern with Earth Map
-    # First draw the Earth map
-    draw_earth_map(ax2)
+    if include_ground_track:
+        # Plot 2: Ground Track Pattern with Earth Map
+        # First draw the pre-rendered Earth map background
+        ax2.imshow(_earth_bg_image(), extent=[-180, 180, -90, 90], aspect='auto', zorder=0)
+        style_earth_axes(ax2)
     
-    # Calculate ground track positions
-    lons = []
-    lats = []
-    plane_colors = []
+        # Cities stay vector so their labels remain readable at the axes size
+        draw_cities(ax2)
     
-    for _, sat in df.iterrows():
-        # More realistic ground track calculation
-        # Convert RAAN and Mean Anomaly to ground track
-        
-        # Simple approximation for demonstration
-        # In reality, this would require proper orbital mechanics
-        lon = (sat['raan'] + sat['mean_anomaly']) % 360
-        if lon > 180:
-            lon = lon - 360  # Convert to -180 to 180 range
-            
-        # Calculate latitude based on inclination and mean anomaly
-        lat = np.arcsin(np.sin(np.radians(constellation_data['inclination'])) * 
-                       np.sin(np.radians(sat['mean_anomaly']))) * 180/np.pi
-        
-        lons.append(lon)
-        lats.append(lat)
-        plane_colors.append(sat['plane'])
+        # Calculate ground track positions
+        lons, lats = calculate_ground_track(df, constellation_data['inclination'])
+        plane_colors = df['plane'].to_numpy()
     
-    # Plot satellites on Earth map with high visibility
-    scatter2 = ax2.scatter(lons, lats, c=plane_colors, cmap='Set1', 
-                          alpha=1.0, s=60, edgecolors='white', linewidth=2,
-                          marker='*', zorder=10)
-    ax2.set_title(f'Satellite Positions on Earth Map\nWalker {constellation_data["total_satellites"]}'
-                 f'/{constellation_data["num_planes"]}/{constellation_data["walker_F"]}',
-                 color='white', fontweight='bold')
+        # Plot satellites on Earth map with high visibility
+        scatter2 = ax2.scatter(lons, lats, c=plane_colors, cmap='Set1', 
+                              alpha=1.0, s=60, edgecolors='white', linewidth=2,
+                              marker='*', zorder=10, rasterized=True)
+        ax2.set_title(f'Satellite Positions on Earth Map\nWalker {constellation_data["total_satellites"]}'
+                     f'/{constellation_data["num_planes"]}/{constellation_data["walker_F"]}',
+                     color='white', fontweight='bold')
     
-    # Add colorbar for plane numbers
-    cbar2 = plt.colorbar(scatter2, ax=ax2, label='Plane Number')
-    cbar2.ax.yaxis.label.set_color('white')
-    cbar2.ax.tick_params(colors='white')
+        # Add colorbar for plane numbers
+        cbar2 = fig.colorbar(scatter2, ax=ax2, label='Plane Number')
+        cbar2.ax.yaxis.label.set_color('white')
+        cbar2.ax.tick_params(colors='white')
     
-    # Add satellite count text
-    ax2.text(0.02, 0.02, f'Total Satellites: {len(lons)}', 
-             transform=ax2.transAxes, color='white', fontweight='bold',
-             bbox=dict(boxstyle='round', facecolor='black', alpha=0.7))
+        # Add satellite count text
+        ax2.text(0.02, 0.02, f'Total Satellites: {len(lons)}', 
+                 transform=ax2.transAxes, color='white', fontweight='bold',
+                 bbox=dict(boxstyle='round', facecolor='black', alpha=0.7))
 
     # Plot 3: Satellites per Plane
-    plane_counts = df['plane'].value_counts().sort_index()
-    bars = ax3.bar(plane_counts.index, plane_counts.values, 
+    counts = plane_counts(sat_data['plane'])
+    bars = ax3.bar(counts.index, counts.values, 
                    color='skyblue', alpha=0.7, edgecolor='navy', linewidth=0.5)
     ax3.set_xlabel('Plane Number')
     ax3.set_ylabel('Number of Satellites')
     ax3.set_title('Satellites Distribution by Plane')
     ax3.grid(True, alpha=0.3)
     
-    # Add value labels on bars
-    for bar in bars:
-        height = bar.get_height()
-        ax3.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                f'{int(height)}', ha='center', va='bottom', fontsize=8)
+    # Add value labels on bars (skipped for many planes, where they would overlap)
+    if len(bars) <= 40:
+        for bar in bars:
+            height = bar.get_height()
+            ax3.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                    f'{int(height)}', ha='center', va='bottom', fontsize=8)
 
     # Plot 4: RAAN Distribution
     n_bins = min(30, constellation_data['num_planes'])
@@ -344,12 +546,18 @@ def create_constellation_plots(constellation_data):
              transform=ax4.transAxes, verticalalignment='top',
              bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
 
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 def generate_tle_file_content(tle_lines):
-    """Generate TLE file content as string"""
-    return '\r\n'.join(tle_lines) + '\r\n'
+    """Generate TLE file content as bytes with CR+LF line endings"""
+    buf = io.BytesIO()
+    crlf = b'\r\n'
+    for line in tle_lines:
+        # UTF-8: TLE lines are ASCII, but names keep any Unicode letters
+        buf.write(line.encode('utf-8'))
+        buf.write(crlf)
+    return buf.getvalue()
 
 def create_validation_report(constellation_data):
     """Create a validation report"""
@@ -378,3 +586,53 @@ TLE Format Details:
 - Line ending: CR+LF (Windows compatible)
 """
     return report
+
+def _check_tle_formatter(n_values=200000, n_constellations=50, seed=0):
+    """Check the compiled TLE formatter against the f-string formatting it replaced"""
+    rng = np.random.default_rng(seed)
+    buf = np.zeros(69, dtype=np.uint8)
+
+    # Angles: random values, near-ties at the 5th decimal and exact Walker spacings
+    angles = np.concatenate([
+        rng.uniform(0, 360, n_values),
+        (rng.integers(0, 3600000, n_values) + 0.5) / 1e4,
+        np.concatenate([np.arange(p) * (360 / p) % 360 for p in range(1, 501)]),
+        [0.0, 0.00005, 0.00004999999, 359.99994, 359.99995, 359.99996]
+    ])
+    for x in angles.tolist():
+        pos = _put_angle(buf, 0, x)
+        assert buf[:pos].tobytes().decode() == f"{x:8.4f}", x
+
+    for width in (2, 3, 5):
+        for v in rng.integers(0, 1000000, n_values // 10).tolist() + [0, 9, 10, 99999, 100000]:
+            pos = _put_int(buf, 0, v, width)
+            assert buf[:pos].tobytes().decode() == f"{v:0{width}d}", (v, width)
+
+    def checksum(line):
+        return sum(int(c) if c.isdigit() else c == '-' for c in line[:68]) % 10
+
+    # Whole lines, including 6-digit NORAD IDs that push line 1 past 68 columns
+    shapes = [(1000, 100)] + [(int(rng.integers(1, 200)), int(rng.integers(1, 60)))
+                              for _ in range(n_constellations)]
+    for planes, per_plane in shapes:
+        inclination = float(rng.uniform(0, 180))
+        tle_lines, data = generate_constellation_tle(
+            float(rng.uniform(300, 2000)), inclination, planes, per_plane,
+            int(rng.integers(0, planes)), rng=rng, epoch=datetime(2024, 2, 29, 13, 37, 42))
+        sat_data = data['satellite_data']
+        epoch_str = f"{data['epoch_year']:02d}{data['epoch_day']:012.8f}"
+        for i in range(data['total_satellites']):
+            line1, line2 = tle_lines[3 * i + 1], tle_lines[3 * i + 2]
+            norad = int(sat_data['norad_id'][i])
+            designator = line1.split()[2].ljust(8)
+            body1 = (f"1 {norad:05d}U {designator} {epoch_str} "
+                     f" .00000000  00000+0  00000-0 0  9999")[:68].ljust(68)
+            body2 = (f"2 {norad:05d} {inclination:8.4f} {sat_data['raan'][i]:8.4f} "
+                     f"{0:07d} {0:8.4f} {sat_data['mean_anomaly'][i]:8.4f} "
+                     f"{data['mean_motion']:11.8f}    1")[:68].ljust(68)
+            assert line1 == body1 + str(checksum(body1)), line1
+            assert line2 == body2 + str(checksum(body2)), line2
+
+if __name__ == '__main__':
+    _check_tle_formatter()
+    print("TLE formatter matches f-string formatting")